@@ -11,9 +11,12 @@ from .._common import cell_data_from_raw, raw_from_cell_data
 from .._exceptions import ReadError, WriteError
 from .._mesh import Mesh
 from .common import (
+    _fast_forward_to_end_block,
+    _fromfile,
     _gmsh_to_meshio_type,
     _meshio_to_gmsh_type,
     _read_data,
+    _read_indexed_values,
     _read_physical_names,
     _write_data,
     _write_physical_names,
@@ -59,8 +62,7 @@ def read_buffer(f, is_ascii, data_size):
             _read_data(f, "ElementData", cell_data_raw, data_size, is_ascii)
         else:
             # skip environment
-            while line != "$End" + environ:
-                line = f.readline().decode("utf-8").strip()
+            _fast_forward_to_end_block(f, environ)
 
     if has_additional_tag_data:
         logging.warning("The file contains tag data that couldn't be processed.")
@@ -88,31 +90,22 @@ def read_buffer(f, is_ascii, data_size):
 
 def _read_nodes(f, is_ascii, data_size):
     # The first line is the number of nodes
-    line = f.readline().decode("utf-8")
-    num_nodes = int(line)
+    num_nodes = int(f.readline())
     if is_ascii:
         points = numpy.fromfile(f, count=num_nodes * 4, sep=" ").reshape((num_nodes, 4))
         # The first number is the index
         points = points[:, 1:]
     else:
         # binary
-        dtype = [("index", c_int), ("x", c_double, (3,))]
-        data = numpy.fromfile(f, count=num_nodes, dtype=dtype)
-        if not (data["index"] == range(1, num_nodes + 1)).all():
-            raise ReadError()
-        points = numpy.ascontiguousarray(data["x"])
+        points = _read_indexed_values(f, num_nodes, 3)
 
-    # Fast forward to $EndNodes
-    line = f.readline().decode("utf-8")
-    while line.strip() != "$EndNodes":
-        line = f.readline().decode("utf-8")
+    _fast_forward_to_end_block(f, "Nodes")
     return points
 
 
 def _read_cells(f, cells, is_ascii):
     # The first line is the number of elements
-    line = f.readline().decode("utf-8")
-    total_num_cells = int(line)
+    total_num_cells = int(f.readline())
     has_additional_tag_data = False
     cell_tags = {}
     if is_ascii:
@@ -120,10 +113,7 @@ def _read_cells(f, cells, is_ascii):
     else:
         _read_cells_binary(f, cells, cell_tags, total_num_cells)
 
-    # Fast forward to $EndElements
-    line = f.readline().decode("utf-8")
-    while line.strip() != "$EndElements":
-        line = f.readline().decode("utf-8")
+    _fast_forward_to_end_block(f, "Elements")
 
     # Subtract one to account for the fact that python indices are
     # 0-based.
@@ -161,11 +151,19 @@ def _read_cells(f, cells, is_ascii):
 
 
 def _read_cells_ascii(f, cells, cell_tags, total_num_cells):
+    # Resolve every gmsh element type only once instead of once per cell:
+    # gmsh type -> (meshio type, number of nodes per cell)
+    cell_types = {}
     for _ in range(total_num_cells):
-        line = f.readline().decode("utf-8")
+        # no need to decode; int() and split() work on bytes
+        line = f.readline()
         data = [int(k) for k in filter(None, line.split())]
-        t = _gmsh_to_meshio_type[data[1]]
-        num_nodes_per_elem = num_nodes_per_cell[t]
+        try:
+            t, num_nodes_per_elem = cell_types[data[1]]
+        except KeyError:
+            t = _gmsh_to_meshio_type[data[1]]
+            num_nodes_per_elem = num_nodes_per_cell[t]
+            cell_types[data[1]] = t, num_nodes_per_elem
 
         if t not in cells:
             cells[t] = []
@@ -214,7 +212,7 @@ def _read_cells_binary(f, cells, cell_tags, total_num_cells):
         # read element data
         shape = (num_elems0, 1 + num_tags + num_nodes_per_elem)
         count = shape[0] * shape[1]
-        data = numpy.fromfile(f, count=count, dtype=c_int).reshape(shape)
+        data = _fromfile(f, c_int, count).reshape(shape)
 
         if t not in cells:
             cells[t] = []
@@ -347,10 +345,8 @@ def _write_nodes(fh, points, binary):
         tmp.tofile(fh)
         fh.write("\n".encode("utf-8"))
     else:
-        for k, x in enumerate(points):
-            fh.write(
-                "{} {!r} {!r} {!r}\n".format(k + 1, x[0], x[1], x[2]).encode("utf-8")
-            )
+        out = numpy.column_stack([numpy.arange(1, len(points) + 1), points])
+        numpy.savetxt(fh, out, "%d %.17g %.17g %.17g")
     fh.write("$EndNodes\n".encode("utf-8"))
     return
 
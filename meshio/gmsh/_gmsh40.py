@@ -12,6 +12,8 @@ from .._common import cell_data_from_raw, raw_from_cell_data
 from .._exceptions import ReadError, WriteError
 from .._mesh import Mesh
 from .common import (
+    _fast_forward_to_end_block,
+    _fromfile,
     _gmsh_to_meshio_type,
     _meshio_to_gmsh_type,
     _read_data,
@@ -70,16 +72,10 @@ def read_buffer(f, is_ascii, data_size):
             # add comments in a .msh file by putting them e.g. inside a
             # $Comments/$EndComments section.
             # ```
-            # skip environment
-            while line != "$End" + environ:
-                line = f.readline()
-                # Skip binary strings, but try to recognize text strings
-                # to catch the end of the environment
-                # See also https://github.com/nschloe/pygalmesh/issues/34
-                try:
-                    line = line.decode("utf-8").strip()
-                except UnicodeDecodeError:
-                    pass
+            # skip environment; this works on the raw bytes, so any binary data
+            # in the section doesn't matter
+            # See also https://github.com/nschloe/pygalmesh/issues/34
+            _fast_forward_to_end_block(f, environ)
 
     cell_data = cell_data_from_raw(cells, cell_data_raw)
     cell_data.update(cell_tags)
@@ -96,7 +92,7 @@ def read_buffer(f, is_ascii, data_size):
 
 def _read_entities(f, is_ascii, data_size):
     physical_tags = tuple({} for _ in range(4))  # dims 0, 1, 2, 3
-    fromfile = partial(numpy.fromfile, sep=" " if is_ascii else "")
+    fromfile = partial(numpy.fromfile, sep=" ") if is_ascii else _fromfile
     number = fromfile(f, c_ulong, 4)  # dims 0, 1, 2, 3
 
     for d, n in enumerate(number):
@@ -121,7 +117,7 @@ def _read_entities(f, is_ascii, data_size):
 def _read_nodes(f, is_ascii, data_size):
     if is_ascii:
         # first line: numEntityBlocks(unsigned long) numNodes(unsigned long)
-        line = f.readline().decode("utf-8")
+        line = f.readline()
         num_entity_blocks, total_num_nodes = [int(k) for k in line.split()]
 
         points = numpy.empty((total_num_nodes, 3), dtype=float)
@@ -131,27 +127,27 @@ def _read_nodes(f, is_ascii, data_size):
         for k in range(num_entity_blocks):
             # first line in the entity block:
             # tagEntity(int) dimEntity(int) typeNode(int) numNodes(unsigned long)
-            line = f.readline().decode("utf-8")
+            line = f.readline()
             tag_entity, dim_entity, type_node, num_nodes = map(int, line.split())
             for i in range(num_nodes):
                 # tag(int) x(double) y(double) z(double)
-                line = f.readline().decode("utf-8")
+                line = f.readline()
                 tag, x, y, z = line.split()
                 points[idx] = [float(x), float(y), float(z)]
-                tags[idx] = tag
+                tags[idx] = int(tag)
                 idx += 1
     else:
         # numEntityBlocks(unsigned long) numNodes(unsigned long)
-        num_entity_blocks, _ = numpy.fromfile(f, count=2, dtype=c_ulong)
+        num_entity_blocks, _ = _fromfile(f, c_ulong, 2)
 
         points = []
         tags = []
         for _ in range(num_entity_blocks):
             # tagEntity(int) dimEntity(int) typeNode(int) numNodes(unsigned long)
-            numpy.fromfile(f, count=3, dtype=c_int)
-            num_nodes = numpy.fromfile(f, count=1, dtype=c_ulong)[0]
+            _fromfile(f, c_int, 3)
+            num_nodes = _fromfile(f, c_ulong, 1)[0]
             dtype = [("tag", c_int), ("x", c_double, (3,))]
-            data = numpy.fromfile(f, count=num_nodes, dtype=dtype)
+            data = _fromfile(f, dtype, num_nodes)
             tags.append(data["tag"])
             points.append(data["x"])
 
@@ -170,7 +166,7 @@ def _read_nodes(f, is_ascii, data_size):
 
 
 def _read_elements(f, point_tags, physical_tags, is_ascii, data_size):
-    fromfile = partial(numpy.fromfile, sep=" " if is_ascii else "")
+    fromfile = partial(numpy.fromfile, sep=" ") if is_ascii else _fromfile
 
     # numEntityBlocks(unsigned long) numElements(unsigned long)
     num_entity_blocks, total_num_elements = fromfile(f, c_ulong, 2)
@@ -244,7 +240,7 @@ def _read_elements(f, point_tags, physical_tags, is_ascii, data_size):
 
 
 def _read_periodic(f, is_ascii):
-    fromfile = partial(numpy.fromfile, sep=" " if is_ascii else "")
+    fromfile = partial(numpy.fromfile, sep=" ") if is_ascii else _fromfile
     periodic = []
     num_periodic = int(fromfile(f, c_int, 1)[0])
     for _ in range(num_periodic):
@@ -372,11 +368,9 @@ def _write_nodes(fh, points, binary):
             )
         )
 
-        for k, x in enumerate(points):
-            # tag(int) x(double) y(double) z(double)
-            fh.write(
-                "{} {!r} {!r} {!r}\n".format(k + 1, x[0], x[1], x[2]).encode("utf-8")
-            )
+        # tag(int) x(double) y(double) z(double)
+        out = numpy.column_stack([numpy.arange(1, len(points) + 1), points])
+        numpy.savetxt(fh, out, "%d %.17g %.17g %.17g")
 
     fh.write("$EndNodes\n".encode("utf-8"))
     return
@@ -12,6 +12,8 @@ from .._common import cell_data_from_raw, raw_from_cell_data
 from .._exceptions import ReadError, WriteError
 from .._mesh import Mesh
 from .common import (
+    _fast_forward_to_end_block,
+    _fromfile,
     _gmsh_to_meshio_type,
     _meshio_to_gmsh_type,
     _read_data,
@@ -76,16 +78,10 @@ def read_buffer(f, is_ascii, data_size):
             # add comments in a .msh file by putting them e.g. inside a
             # $Comments/$EndComments section.
             # ```
-            # skip environment
-            while line != "$End" + environ:
-                line = f.readline()
-                # Skip binary strings, but try to recognize text strings
-                # to catch the end of the environment
-                # See also https://github.com/nschloe/pygalmesh/issues/34
-                try:
-                    line = line.decode("utf-8").strip()
-                except UnicodeDecodeError:
-                    pass
+            # skip environment; this works on the raw bytes, so any binary data
+            # in the section doesn't matter
+            # See also https://github.com/nschloe/pygalmesh/issues/34
+            _fast_forward_to_end_block(f, environ)
 
     cell_data = cell_data_from_raw(cells, cell_data_raw)
     cell_data.update(cell_tags)
@@ -101,7 +97,7 @@ def read_buffer(f, is_ascii, data_size):
 
 
 def _read_entities(f, is_ascii, data_size):
-    fromfile = partial(numpy.fromfile, sep=" " if is_ascii else "")
+    fromfile = partial(numpy.fromfile, sep=" ") if is_ascii else _fromfile
     c_size_t = _size_type(data_size)
     physical_tags = tuple({} for _ in range(4))  # dims 0, 1, 2, 3
     number = fromfile(f, c_size_t, 4)  # dims 0, 1, 2, 3
@@ -127,7 +123,7 @@ def _read_entities(f, is_ascii, data_size):
 
 
 def _read_nodes(f, is_ascii, data_size):
-    fromfile = partial(numpy.fromfile, sep=" " if is_ascii else "")
+    fromfile = partial(numpy.fromfile, sep=" ") if is_ascii else _fromfile
     c_size_t = _size_type(data_size)
 
     # numEntityBlocks numNodes minNodeTag maxNodeTag (all size_t)
@@ -174,7 +170,7 @@ def _read_nodes(f, is_ascii, data_size):
 
 
 def _read_elements(f, point_tags, physical_tags, is_ascii, data_size):
-    fromfile = partial(numpy.fromfile, sep=" " if is_ascii else "")
+    fromfile = partial(numpy.fromfile, sep=" ") if is_ascii else _fromfile
     c_size_t = _size_type(data_size)
 
     # numEntityBlocks numElements minElementTag maxElementTag (all size_t)
@@ -250,7 +246,7 @@ def _read_elements(f, point_tags, physical_tags, is_ascii, data_size):
 
 
 def _read_periodic(f, is_ascii, data_size):
-    fromfile = partial(numpy.fromfile, sep=" " if is_ascii else "")
+    fromfile = partial(numpy.fromfile, sep=" ") if is_ascii else _fromfile
     c_size_t = _size_type(data_size)
     periodic = []
     # numPeriodicLinks(size_t)
@@ -1,5 +1,6 @@
+import io
 import logging
-import shlex
+import re
 
 import numpy
 
@@ -9,34 +10,133 @@ from .._exceptions import ReadError, WriteError
 c_int = numpy.dtype("i")
 c_double = numpy.dtype("d")
 
+# number of index/values records processed at once in binary data blocks
+_chunk_size = 2 ** 16
+# number of bytes scanned at once when looking for the end of a section
+_scan_chunk_size = 2 ** 16
+
+
+def _fromfile(f, dtype, count):
+    """Read `count` items of `dtype` from the binary stream `f`.
+
+    Unlike numpy.fromfile, this reads straight into a preallocated array via
+    `readinto()` and hence doesn't need to sync the position of Python's file
+    buffer; it also works on any buffered stream, not just on real files.
+    """
+    data = numpy.empty(count, dtype=dtype)
+    _readinto(f, data)
+    return data
+
+
+def _readinto(f, data):
+    num_bytes = f.readinto(memoryview(data).cast("B"))
+    if num_bytes != data.nbytes:
+        raise ReadError()
+
+
+def _read_indexed_values(f, num_items, num_components):
+    """Read `num_items` binary records `index(int) values(double) * num_components`
+    and return the values as a contiguous (num_items, num_components) array. The
+    indices must be 1, 2, ..., num_items.
+    """
+    # Read chunks of records into a small scratch buffer and copy the values straight
+    # into place. Reading all records at once and extracting the values afterwards
+    # would temporarily need twice the memory.
+    dtype = [("index", c_int), ("values", c_double, (num_components,))]
+    scratch = numpy.empty(min(num_items, _chunk_size), dtype=dtype)
+    values = numpy.empty((num_items, num_components), dtype=c_double)
+    # The indices of the chunk starting at `start` are `start + index`. Shift the
+    # scratch indices in place instead of creating a new arange per chunk.
+    index = numpy.arange(1, len(scratch) + 1, dtype=c_int)
+    for start in range(0, num_items, _chunk_size):
+        block = scratch[: min(_chunk_size, num_items - start)]
+        _readinto(f, block)
+        n = len(block)
+        block["index"] -= start
+        if not numpy.array_equal(block["index"], index[:n]):
+            raise ReadError()
+        values[start : start + n] = block["values"]
+    return values
+
+
+def _fast_forward_to_end_block(f, block):
+    """Skip everything up to and including the line `$End{block}`.
+    """
+    end = "$End{}".format(block).encode("utf-8")
+    msg = "Couldn't find $End{}".format(block)
+
+    # Mostly, the end marker is right on the next line, possibly behind the blank
+    # line that follows binary data.
+    line = f.readline()
+    while line and not line.strip():
+        line = f.readline()
+    if line.strip() == end:
+        return
+    if not line:
+        raise ReadError(msg)
+
+    if not f.seekable():
+        while line.strip() != end:
+            line = f.readline()
+            if not line:
+                raise ReadError(msg)
+        return
+
+    # Otherwise scan the stream in large chunks rather than line by line; this also
+    # doesn't care about binary data in between. Like the line-by-line comparison,
+    # only accept the marker on a line of its own, surrounded by whitespace.
+    marker = re.compile(b"\n[ \t\r\v\f]*" + re.escape(end) + b"[ \t\r\v\f]*\n")
+    # The part of the previous chunk after its last newline; the marker line might
+    # straddle two chunks.
+    tail = b"\n"
+    while True:
+        chunk = f.read(_scan_chunk_size)
+        if not chunk:
+            # The marker may be the very last line, without a trailing newline.
+            if tail.strip() == end:
+                return
+            raise ReadError(msg)
+        data = tail + chunk
+        m = marker.search(data)
+        if m:
+            # Go back to right behind the marker line.
+            f.seek(m.end() - len(data), io.SEEK_CUR)
+            return
+        # Carry over the last, unfinished line if it may still become the marker.
+        # Don't carry over anything else, e.g., long stretches of binary data.
+        k = data.rfind(b"\n")
+        tail = data[k:] if k >= 0 else b""
+        rest = tail.lstrip()
+        if not (end.startswith(rest) or rest.rstrip() == end):
+            tail = b""
+
 
 def _read_physical_names(f, field_data):
-    line = f.readline().decode("utf-8")
-    num_phys_names = int(line)
+    num_phys_names = int(f.readline())
     for _ in range(num_phys_names):
-        line = shlex.split(f.readline().decode("utf-8"))
-        key = line[2]
-        value = numpy.array(line[1::-1], dtype=int)
-        field_data[key] = value
+        # physical-dimension(ASCII int) physical-tag(ASCII int) "physical-name"
+        dim, tag, name = f.readline().split(maxsplit=2)
+        name = name.decode("utf-8").strip().strip('"')
+        field_data[name] = numpy.array([int(tag), int(dim)])
     line = f.readline().decode("utf-8")
     if line.strip() != "$EndPhysicalNames":
         raise ReadError()
 
 
 def _read_data(f, tag, data_dict, data_size, is_ascii):
-    # Read string tags
-    num_string_tags = int(f.readline().decode("utf-8"))
+    # Read string tags. int() works on bytes directly; only decode the strings.
+    num_string_tags = int(f.readline())
     string_tags = [
         f.readline().decode("utf-8").strip().replace('"', "")
         for _ in range(num_string_tags)
     ]
     # The real tags typically only contain one value, the time.
     # Discard it.
-    num_real_tags = int(f.readline().decode("utf-8"))
+    num_real_tags = int(f.readline())
     for _ in range(num_real_tags):
         f.readline()
-    num_integer_tags = int(f.readline().decode("utf-8"))
-    integer_tags = [int(f.readline().decode("utf-8")) for _ in range(num_integer_tags)]
+    num_integer_tags = int(f.readline())
+    integer_tags = [int(f.readline()) for _ in range(num_integer_tags)]
     num_components = integer_tags[1]
     num_items = integer_tags[2]
     if is_ascii:
@@ -47,16 +147,9 @@ def _read_data(f, tag, data_dict, data_size, is_ascii):
         data = data[:, 1:]
     else:
         # binary
-        dtype = [("index", c_int), ("values", c_double, (num_components,))]
-        data = numpy.fromfile(f, count=num_items, dtype=dtype)
-        if not (data["index"] == range(1, num_items + 1)).all():
-            raise ReadError()
-        data = numpy.ascontiguousarray(data["values"])
+        data = _read_indexed_values(f, num_items, num_components)
 
-    # fast forward to $End{tag}
-    line = f.readline().decode("utf-8")
-    while line.strip() != "$End{}".format(tag):
-        line = f.readline().decode("utf-8")
+    _fast_forward_to_end_block(f, tag)
 
     # The gmsh format cannot distingiush between data of shape (n,) and (n, 1).
     # If shape[1] == 1, cut it off.
@@ -148,30 +241,13 @@ def _write_physical_names(fh, field_data):
             logging.warning("Field data contains entry that cannot be processed.")
     entries.sort()
     if entries:
-        fh.write("$PhysicalNames\n".encode("utf-8"))
-        fh.write("{}\n".format(len(entries)).encode("utf-8"))
-        for entry in entries:
-            fh.write('{} {} "{}"\n'.format(*entry).encode("utf-8"))
-        fh.write("$EndPhysicalNames\n".encode("utf-8"))
+        lines = ["$PhysicalNames", "{}".format(len(entries))]
+        lines += ['{} {} "{}"'.format(*entry) for entry in entries]
+        lines += ["$EndPhysicalNames"]
+        fh.write(("\n".join(lines) + "\n").encode("utf-8"))
 
 
 def _write_data(fh, tag, name, data, binary):
-    fh.write("${}\n".format(tag).encode("utf-8"))
-    # <http://gmsh.info/doc/texinfo/gmsh.html>:
-    # > Number of string tags.
-    # > gives the number of string tags that follow. By default the first
-    # > string-tag is interpreted as the name of the post-processing view and
-    # > the second as the name of the interpolation scheme. The interpolation
-    # > scheme is provided in the $InterpolationScheme section (see below).
-    fh.write("{}\n".format(1).encode("utf-8"))
-    fh.write('"{}"\n'.format(name).encode("utf-8"))
-    fh.write("{}\n".format(1).encode("utf-8"))
-    fh.write("{}\n".format(0.0).encode("utf-8"))
-    # three integer tags:
-    fh.write("{}\n".format(3).encode("utf-8"))
-    # time step
-    fh.write("{}\n".format(0).encode("utf-8"))
-    # number of components
     num_components = data.shape[1] if len(data.shape) > 1 else 1
     if num_components not in [
         1,
@@ -185,28 +261,55 @@ def _write_data(fh, tag, name, data, binary):
     if len(data.shape) > 1 and data.shape[1] == 1:
         data = data[:, 0]
 
-    fh.write("{}\n".format(num_components).encode("utf-8"))
-    # num data items
-    fh.write("{}\n".format(data.shape[0]).encode("utf-8"))
+    # Assemble the header and write it at once rather than line by line.
+    header = [
+        "${}".format(tag),
+        # <http://gmsh.info/doc/texinfo/gmsh.html>:
+        # > Number of string tags.
+        # > gives the number of string tags that follow. By default the first
+        # > string-tag is interpreted as the name of the post-processing view and
+        # > the second as the name of the interpolation scheme. The interpolation
+        # > scheme is provided in the $InterpolationScheme section (see below).
+        "1",
+        '"{}"'.format(name),
+        "1",
+        "{}".format(0.0),
+        # three integer tags:
+        "3",
+        # time step
+        "0",
+        # number of components
+        "{}".format(num_components),
+        # num data items
+        "{}".format(data.shape[0]),
+    ]
+    fh.write(("\n".join(header) + "\n").encode("utf-8"))
     # actually write the data
     if binary:
-        if num_components == 1:
-            dtype = [("index", c_int), ("data", c_double)]
-        else:
-            dtype = [("index", c_int), ("data", c_double, num_components)]
-        tmp = numpy.empty(len(data), dtype=dtype)
-        tmp["index"] = 1 + numpy.arange(len(data))
-        tmp["data"] = data
-        tmp.tofile(fh)
+        # Gmsh wants index and values interleaved, so a copy is unavoidable. Fill a
+        # fixed-size scratch buffer block by block instead of creating an
+        # interleaved copy of the entire data array at once.
+        data = data.reshape(len(data), num_components)
+        dtype = [("index", c_int), ("data", c_double, (num_components,))]
+        tmp = numpy.empty(min(len(data), _chunk_size), dtype=dtype)
+        index = numpy.arange(1, len(tmp) + 1, dtype=c_int)
+        for start in range(0, len(data), _chunk_size):
+            block = data[start : start + _chunk_size]
+            n = len(block)
+            # shift the 1-based chunk indices in place, no temporaries
+            numpy.add(index[:n], start, out=tmp["index"][:n])
+            tmp["data"][:n] = block
+            # Write through the file object instead of tofile() so the bytes go
+            # through its buffer, too.
+            fh.write(tmp[:n])
         fh.write("\n".encode("utf-8"))
     else:
-        fmt = " ".join(["{}"] + ["{!r}"] * num_components) + "\n"
-        # TODO unify
-        if num_components == 1:
-            for k, x in enumerate(data):
-                fh.write(fmt.format(k + 1, x).encode("utf-8"))
-        else:
-            for k, x in enumerate(data):
-                fh.write(fmt.format(k + 1, *x).encode("utf-8"))
+        # Prepend the 1-based index column and format everything in one go.
+        # "%.17g" has enough digits to round-trip doubles.
+        fmt = " ".join(["%d"] + ["%.17g"] * num_components)
+        out = numpy.empty((len(data), 1 + num_components))
+        out[:, 0] = numpy.arange(1, len(data) + 1)
+        out[:, 1:] = data.reshape(len(data), -1)
+        numpy.savetxt(fh, out, fmt)
 
     fh.write("$End{}\n".format(tag).encode("utf-8"))
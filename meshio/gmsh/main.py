@@ -1,17 +1,40 @@
+import os
 import struct
 
 from .._exceptions import ReadError
 from .._helpers import register
 from . import _gmsh22, _gmsh40, _gmsh41
-
-_readers = {"2": _gmsh22, "4": _gmsh40, "4.0": _gmsh40, "4.1": _gmsh41}
-_writers = {"2": _gmsh22, "4": _gmsh41, "4.0": _gmsh40, "4.1": _gmsh41}
+from .common import _fast_forward_to_end_block
+
+# Keyed by full and by major version; the latter is the fallback for minor versions
+# that aren't listed explicitly.
+_readers = {"2": _gmsh22, "2.2": _gmsh22, "4": _gmsh40, "4.0": _gmsh40, "4.1": _gmsh41}
+_writers = {"2": _gmsh22, "2.2": _gmsh22, "4": _gmsh41, "4.0": _gmsh40, "4.1": _gmsh41}
+
+
+def _lookup(modules, fmt_version):
+    module = modules.get(fmt_version)
+    if module is None:
+        module = modules.get(fmt_version.split(".")[0])
+    if module is None:
+        raise ValueError(
+            "Need mesh format in {} (got {})".format(
+                sorted(modules.keys()), fmt_version
+            )
+        )
+    return module
 
 
 def read(filename):
     """Reads a Gmsh msh file.
     """
     with open(filename, "rb") as f:
+        # The file is read front to back; let the kernel read ahead aggressively.
+        if hasattr(os, "posix_fadvise"):
+            try:
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            except OSError:
+                pass
         mesh = read_buffer(f)
     return mesh
 
@@ -23,25 +46,14 @@ def read_buffer(f):
 
     # skip any $Comments/$EndComments sections
     while line == "$Comments":
-        while line != "$EndComments":
-            line = f.readline().decode("utf-8").strip()
+        _fast_forward_to_end_block(f, "Comments")
         line = f.readline().decode("utf-8").strip()
 
     if line != "$MeshFormat":
         raise ReadError()
     fmt_version, data_size, is_ascii = _read_header(f)
 
-    try:
-        reader = _readers[fmt_version]
-    except KeyError:
-        try:
-            reader = _readers[fmt_version.split(".")[0]]
-        except KeyError:
-            raise ValueError(
-                "Need mesh format in {} (got {})".format(
-                    sorted(_readers.keys()), fmt_version
-                )
-            )
+    reader = _lookup(_readers, fmt_version)
     return reader.read_buffer(f, is_ascii, data_size)
 
 
@@ -76,28 +88,14 @@ def _read_header(f):
         one = f.read(struct.calcsize("i"))
         if struct.unpack("i", one)[0] != 1:
             raise ReadError()
-    # Fast forward to $EndMeshFormat
-    line = f.readline().decode("utf-8")
-    while line.strip() != "$EndMeshFormat":
-        line = f.readline().decode("utf-8")
+    _fast_forward_to_end_block(f, "MeshFormat")
     return fmt_version, data_size, is_ascii
 
 
 def write(filename, mesh, fmt_version="4.1", binary=True):
     """Writes a Gmsh msh file.
     """
-    try:
-        writer = _writers[fmt_version]
-    except KeyError:
-        try:
-            writer = _writers[fmt_version.split(".")[0]]
-        except KeyError:
-            raise ValueError(
-                "Need mesh format in {} (got {})".format(
-                    sorted(_writers.keys()), fmt_version
-                )
-            )
-
+    writer = _lookup(_writers, fmt_version)
     writer.write(filename, mesh, binary=binary)
 
 
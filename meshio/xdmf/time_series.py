@@ -38,20 +38,22 @@ class TimeSeriesReader:
         if version.split(".")[0] != "3":
             raise ReadError("Unknown XDMF version {}.".format(version))
 
-        domains = list(root)
-        if len(domains) != 1:
+        if len(root) != 1:
             raise ReadError()
-        self.domain = domains[0]
+        self.domain = root[0]
         if self.domain.tag != "Domain":
             raise ReadError()
 
-        grids = list(self.domain)
-
-        # find the collection grid
+        # find the collection grid and the uniform grid in a single pass
         collection_grid = None
-        for g in grids:
-            if g.attrib["GridType"] == "Collection":
+        self.mesh_grid = None
+        for g in self.domain.iterchildren():
+            grid_type = g.attrib["GridType"]
+            if grid_type == "Collection":
                 collection_grid = g
+            elif grid_type == "Uniform":
+                self.mesh_grid = g
+
         if collection_grid is None:
             raise ReadError("Couldn't find the mesh grid")
         if collection_grid.tag != "Grid":
@@ -64,12 +66,8 @@ class TimeSeriesReader:
         self.num_steps = len(self.collection)
         self.cells = None
         self.hdf5_files = {}
+        self.hdf5_datasets = {}
 
-        # find the uniform grid
-        self.mesh_grid = None
-        for g in grids:
-            if g.attrib["GridType"] == "Uniform":
-                self.mesh_grid = g
         # if not found, take the first uniform grid in the collection grid
         if self.mesh_grid is None:
             for g in self.collection:
@@ -84,6 +82,28 @@ class TimeSeriesReader:
         if self.mesh_grid.tag != "Grid":
             raise ReadError()
 
+        # Collect time and attributes of all steps in one sweep so that read_data()
+        # doesn't have to traverse the tree again
+        self._steps = [self._parse_step(g) for g in self.collection]
+
+    @staticmethod
+    def _parse_step(grid):
+        t = None
+        attributes = []
+        for c in grid.iterchildren():
+            if c.tag == "Time":
+                t = float(c.attrib["Value"])
+            elif c.tag == "Attribute":
+                center = c.attrib["Center"]
+                if center not in ["Node", "Cell"]:
+                    raise ReadError()
+                data_items = list(c.iterchildren())
+                if len(data_items) != 1:
+                    raise ReadError()
+                attributes.append((c.attrib["Name"], center, data_items[0]))
+            # else: skip the xi:included mesh
+        return t, attributes
+
     def __enter__(self):
         return self
 
@@ -144,28 +164,13 @@ class TimeSeriesReader:
         point_data = {}
         cell_data_raw = {}
 
-        t = None
-
-        for c in list(self.collection[k]):
-            if c.tag == "Time":
-                t = float(c.attrib["Value"])
-            elif c.tag == "Attribute":
-                name = c.attrib["Name"]
-
-                if len(list(c)) != 1:
-                    raise ReadError()
-                data_item = list(c)[0]
-                data = self._read_data_item(data_item)
-
-                if c.attrib["Center"] == "Node":
-                    point_data[name] = data
-                else:
-                    if c.attrib["Center"] != "Cell":
-                        raise ReadError()
-                    cell_data_raw[name] = data
+        t, attributes = self._steps[k]
+        for name, center, data_item in attributes:
+            data = self._read_data_item(data_item)
+            if center == "Node":
+                point_data[name] = data
             else:
-                # skip the xi:included mesh
-                continue
+                cell_data_raw[name] = data
 
         if self.cells is None:
             raise ReadError()
@@ -176,6 +181,9 @@ class TimeSeriesReader:
         return t, point_data, cell_data
 
     def _read_data_item(self, data_item):
+        if data_item.attrib.get("ItemType") == "HyperSlab":
+            return self._read_hyperslab(data_item)
+
         dims = [int(d) for d in data_item.attrib["Dimensions"].split()]
 
         # Actually, `NumberType` is XDMF2 and `DataType` XDMF3, but many files out there
@@ -212,12 +220,41 @@ class TimeSeriesReader:
                 "Unknown XDMF Format '{}'.".format(data_item.attrib["Format"])
             )
 
+        # `[()]` gives a numpy.ndarray
+        return self._hdf5_dataset(data_item)[()]
+
+    def _read_hyperslab(self, data_item):
+        dims = [int(d) for d in data_item.attrib["Dimensions"].split()]
+
+        data_items = list(data_item)
+        if len(data_items) != 2:
+            raise ReadError()
+        selection, source = data_items
+
+        start, stride, count = self._read_data_item(selection)
+        idx = tuple(slice(b, b + s * c, s) for b, s, c in zip(start, stride, count))
+
+        if source.attrib["Format"] == "HDF":
+            # Only read the slab, not the entire dataset
+            data = self._hdf5_dataset(source)[idx]
+        else:
+            data = self._read_data_item(source)[idx]
+        return data.reshape(dims)
+
+    def _hdf5_dataset(self, data_item):
         info = data_item.text.strip()
         filename, h5path = info.split(":")
 
         # The HDF5 file path is given with respect to the XDMF (XML) file.
         full_hdf5_path = os.path.join(os.path.dirname(self.filename), filename)
 
+        # Many steps reference the same datasets, e.g., the slabs of a time series
+        # attribute; resolve each path only once.
+        try:
+            return self.hdf5_datasets[(full_hdf5_path, h5path)]
+        except KeyError:
+            pass
+
         if full_hdf5_path in self.hdf5_files:
             f = self.hdf5_files[full_hdf5_path]
         else:
@@ -229,10 +266,9 @@ class TimeSeriesReader:
         if h5path[0] != "/":
             raise ReadError()
 
-        for key in h5path[1:].split("/"):
-            f = f[key]
-        # `[()]` gives a numpy.ndarray
-        return f[()]
+        dataset = f[h5path]
+        self.hdf5_datasets[(full_hdf5_path, h5path)] = dataset
+        return dataset
 
 
 class TimeSeriesWriter:
@@ -266,6 +302,10 @@ class TimeSeriesWriter:
         self.has_mesh = False
         self.mesh_name = None
 
+        # Extendible HDF5 datasets holding one attribute over all time steps, keyed
+        # by (center, name), and the DataItems that reference them
+        self._series_datasets = {}
+
     def __enter__(self):
         if self.data_format == "HDF":
             import h5py
@@ -275,7 +315,23 @@ class TimeSeriesWriter:
         return self
 
     def __exit__(self, *args):
-        self.h5_file.close()
+        # Serialize the XML only once, after all steps have been added, rather than
+        # rewriting the entire (growing) file in every step.
+        self.flush()
+        if self.data_format == "HDF":
+            self.h5_file.close()
+
+    def flush(self):
+        """Write everything added so far to disk. This happens automatically when
+        leaving the `with` block; call it explicitly to persist the progress of a
+        long-running series, but not in every step: each call serializes the entire
+        XML file.
+        """
+        for dataset, sources in self._series_datasets.values():
+            _set_source_dimensions(dataset, sources)
+        write_xml(self.filename, self.xdmf_file, self.pretty_xml)
+        if self.data_format == "HDF":
+            self.h5_file.flush()
 
     def write_points_cells(self, points, cells):
         # <Grid Name="mesh" GridType="Uniform">
@@ -296,8 +352,6 @@ class TimeSeriesWriter:
         self.cells(cells, grid)
         self.has_mesh = True
 
-        write_xml(self.filename, self.xdmf_file, self.pretty_xml)
-
     def write_data(self, t, point_data=None, cell_data=None):
         # <Grid>
         #   <xi:include xpointer="xpointer(//Grid[@Name=&quot;TimeSeries_phi&quot;]/Grid[1]/*[self::Topology or self::Geometry])" />
@@ -322,13 +376,14 @@ class TimeSeriesWriter:
         if cell_data:
             self.cell_data(cell_data, grid)
 
-        write_xml(self.filename, self.xdmf_file, self.pretty_xml)
-
     def numpy_to_xml_string(self, data):
+        # Make a C-contiguous copy once, if necessary at all, rather than leaving it to
+        # savetxt, tofile, or h5py which may copy it again internally.
+        data = numpy.ascontiguousarray(data)
         if self.data_format == "XML":
             s = BytesIO()
             fmt = dtype_to_format_string[data.dtype.name]
-            numpy.savetxt(s, data.flatten(), fmt)
+            numpy.savetxt(s, data.ravel(), fmt)
             return s.getvalue().decode()
         elif self.data_format == "Binary":
             bin_filename = "{}{}.bin".format(
@@ -402,23 +457,30 @@ class TimeSeriesWriter:
                 TopologyType="Mixed",
                 NumberOfElements=str(total_num_cells),
             )
-            total_num_cell_items = sum(numpy.prod(c.shape) for c in cells.values())
-            dim = total_num_cell_items + total_num_cells
-            # Lines translate to Polylines, and one needs to specify the exact
-            # number of nodes. Hence, prepend 2.
-            if "line" in cells:
-                cells["line"] = numpy.insert(cells["line"], 0, 2, axis=1)
-                dim += len(cells["line"])
-            dim = str(dim)
-            cd = numpy.concatenate(
-                [
-                    # prepend column with xdmf type index
-                    numpy.insert(
-                        value, 0, meshio_type_to_xdmf_index[key], axis=1
-                    ).flatten()
-                    for key, value in cells.items()
-                ]
+            # Each cell is prefixed by its xdmf type index. Lines translate to
+            # Polylines, and one needs to specify the exact number of nodes. Hence,
+            # prepend 2 for those as well.
+            prefixes = {
+                key: [meshio_type_to_xdmf_index[key]] + ([2] if key == "line" else [])
+                for key in cells
+            }
+            total_num_items = sum(
+                c.shape[0] * (len(prefixes[key]) + c.shape[1])
+                for key, c in cells.items()
             )
+            dim = str(total_num_items)
+            # Fill one flat array block by block instead of inserting the prefixes
+            # and concatenating, which would copy all cell data several times.
+            cd = numpy.empty(total_num_items, dtype=numpy.result_type(*cells.values()))
+            offset = 0
+            for key, value in cells.items():
+                num_prefixes = len(prefixes[key])
+                shape = (value.shape[0], num_prefixes + value.shape[1])
+                n = shape[0] * shape[1]
+                block = cd[offset : offset + n].reshape(shape)
+                block[:, :num_prefixes] = prefixes[key]
+                block[:, num_prefixes:] = value
+                offset += n
             dt, prec = numpy_to_xdmf_dtype[cd.dtype.name]
             data_item = ET.SubElement(
                 topo,
@@ -441,17 +503,7 @@ class TimeSeriesWriter:
                 AttributeType=attribute_type(data),
                 Center="Node",
             )
-            dt, prec = numpy_to_xdmf_dtype[data.dtype.name]
-            dim = " ".join([str(s) for s in data.shape])
-            data_item = ET.SubElement(
-                att,
-                "DataItem",
-                DataType=dt,
-                Dimensions=dim,
-                Format=self.data_format,
-                Precision=prec,
-            )
-            data_item.text = self.numpy_to_xml_string(data)
+            self.attribute_data_item(att, ("Node", name), data)
 
     def cell_data(self, cell_data, grid):
         from lxml import etree as ET
@@ -465,8 +517,15 @@ class TimeSeriesWriter:
                 AttributeType=attribute_type(data),
                 Center="Cell",
             )
-            dt, prec = numpy_to_xdmf_dtype[data.dtype.name]
-            dim = " ".join([str(s) for s in data.shape])
+            self.attribute_data_item(att, ("Cell", name), data)
+
+    def attribute_data_item(self, att, key, data):
+        from lxml import etree as ET
+
+        dt, prec = numpy_to_xdmf_dtype[data.dtype.name]
+        dim = " ".join([str(s) for s in data.shape])
+
+        if self.data_format != "HDF":
             data_item = ET.SubElement(
                 att,
                 "DataItem",
@@ -476,3 +535,87 @@ class TimeSeriesWriter:
                 Precision=prec,
             )
             data_item.text = self.numpy_to_xml_string(data)
+            return
+
+        # Append the data to one extendible dataset per attribute instead of
+        # creating a new dataset for every time step. Each step then references its
+        # slice of the dataset through a HyperSlab:
+        #
+        # <DataItem ItemType="HyperSlab" Dimensions="8457 1">
+        #   <DataItem DataType="Int" Dimensions="3 3" Format="XML">
+        #     1 0 0
+        #     1 1 1
+        #     1 8457 1
+        #   </DataItem>
+        #   <DataItem Dimensions="5 8457 1" Format="HDF">out.h5:/data2</DataItem>
+        # </DataItem>
+        try:
+            dataset, sources = self._series_datasets[key]
+        except KeyError:
+            dataset = None
+        if (
+            dataset is None
+            or dataset.shape[1:] != data.shape
+            or dataset.dtype != data.dtype
+        ):
+            if dataset is not None:
+                # the old dataset won't grow anymore
+                _set_source_dimensions(dataset, sources)
+            name = "data{}".format(self.data_counter)
+            self.data_counter += 1
+            dataset = self.h5_file.create_dataset(
+                name,
+                shape=(0,) + data.shape,
+                maxshape=(None,) + data.shape,
+                dtype=data.dtype,
+                chunks=_step_chunks(data.shape, data.dtype.itemsize),
+            )
+            sources = []
+            self._series_datasets[key] = dataset, sources
+
+        step = dataset.shape[0]
+        dataset.resize(step + 1, axis=0)
+        dataset[step] = numpy.ascontiguousarray(data)
+
+        hyperslab = ET.SubElement(att, "DataItem", ItemType="HyperSlab", Dimensions=dim)
+        selection = ET.SubElement(
+            hyperslab,
+            "DataItem",
+            DataType="Int",
+            Dimensions="3 {}".format(dataset.ndim),
+            Format="XML",
+        )
+        start = [step] + [0] * data.ndim
+        stride = [1] * dataset.ndim
+        count = [1] + list(data.shape)
+        selection.text = "\n".join(
+            " ".join(str(i) for i in row) for row in [start, stride, count]
+        )
+        source = ET.SubElement(
+            hyperslab, "DataItem", DataType=dt, Format="HDF", Precision=prec,
+        )
+        source.text = os.path.basename(self.h5_filename) + ":/" + dataset.name[1:]
+        # The Dimensions of the source are only known once the series is complete;
+        # they're set in __exit__.
+        sources.append(source)
+
+
+def _step_chunks(shape, itemsize):
+    """HDF5 chunk shape for a time series dataset that holds one step of `shape` per
+    row: one step per chunk, so appending and reading a step touch only its own
+    chunks. Steps too large for a single chunk (HDF5 caps chunks at 4 GiB) are split
+    along their largest axes.
+    """
+    max_chunk_bytes = 2 ** 32 - 1
+    chunks = [1] + [max(1, s) for s in shape]
+    while numpy.prod(chunks, dtype=numpy.uint64) * itemsize > max_chunk_bytes:
+        k = int(numpy.argmax(chunks))
+        chunks[k] = (chunks[k] + 1) // 2
+    return tuple(chunks)
+
+
+def _set_source_dimensions(dataset, sources):
+    # All steps reference the same dataset, so they all get its final size.
+    dim = " ".join([str(s) for s in dataset.shape])
+    for item in sources:
+        item.attrib["Dimensions"] = dim
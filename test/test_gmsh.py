@@ -1,7 +1,9 @@
 import copy
 import os
+import tempfile
 from functools import partial
 
+import numpy
 import pytest
 
 import helpers
@@ -110,6 +112,72 @@ def test_gmsh41(mesh, binary):
     helpers.write_read(writer, meshio.gmsh.read, mesh, 1.0e-15)
 
 
+@pytest.mark.parametrize("scan_chunk_size", [5, 2 ** 16])
+@pytest.mark.parametrize("binary", [False, True])
+def test_skip_sections(binary, scan_chunk_size, monkeypatch):
+    # comments, unknown sections (possibly with binary content), and trailing junk
+    # in known sections are skipped; end markers only count on a line of their own
+    monkeypatch.setattr(meshio.gmsh.common, "_scan_chunk_size", scan_chunk_size)
+    points = numpy.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0]])
+    if binary:
+        nodes = numpy.empty(3, dtype=[("index", "i"), ("x", "d", (3,))])
+        nodes["index"] = [1, 2, 3]
+        nodes["x"] = points
+        # element type, number of elements, number of tags; element number, nodes
+        elements = numpy.array([2, 1, 0, 1, 1, 2, 3], dtype="i")
+        header = [b"2.2 1 8", numpy.array(1, dtype="i").tobytes()]
+        nodes = [nodes.tobytes()]
+        elements = [elements.tobytes()]
+    else:
+        header = [b"2.2 0 8"]
+        nodes = [b"1 0.0 0.0 0.0", b"2 1.0 0.0 0.0", b"3 0.0 1.0 0.0"]
+        elements = [b"1 2 0 1 2 3"]
+
+    content = b"\n".join(
+        [b"$Comments", b"some comment", b"$EndComments", b"$MeshFormat"]
+        + header
+        + [
+            b"$EndMeshFormat",
+            b"$Unknown",
+            b"\x00\xff binary $EndUnk",
+            b"$EndUnknownSection",
+            b"x$EndUnknown",
+            b" \t$EndUnknown ",
+            b"$Nodes",
+            b"3",
+        ]
+        + nodes
+        + [b"junk", b"$EndNodes", b"$Elements", b"1"]
+        + elements
+        + [b"$EndElements", b""]
+    )
+    with tempfile.TemporaryDirectory() as temp_dir:
+        filepath = os.path.join(temp_dir, "test.msh")
+        with open(filepath, "wb") as f:
+            f.write(content)
+        mesh = meshio.gmsh.read(filepath)
+
+    assert numpy.array_equal(mesh.points, points)
+    assert mesh.cells["triangle"].tolist() == [[0, 1, 2]]
+
+
+@pytest.mark.parametrize(
+    "mesh",
+    [
+        helpers.add_point_data(helpers.tri_mesh, 1),
+        helpers.add_point_data(helpers.tri_mesh, 3),
+        helpers.add_cell_data(helpers.tri_mesh, 9),
+    ],
+)
+@pytest.mark.parametrize("fmt_version", ["2", "4.0", "4.1"])
+def test_binary_chunks(mesh, fmt_version, monkeypatch):
+    # binary index/value records are processed in chunks; make sure the data goes
+    # across several of them, including a short last one
+    monkeypatch.setattr(meshio.gmsh.common, "_chunk_size", 3)
+    writer = partial(meshio.gmsh.write, fmt_version=fmt_version, binary=True)
+    helpers.write_read(writer, meshio.gmsh.read, mesh, 1.0e-15)
+
+
 def test_generic_io():
     helpers.generic_io("test.msh")
     # With additional, insignificant suffix:
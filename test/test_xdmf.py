@@ -59,11 +59,12 @@ def test_generic_io():
     helpers.generic_io("test.0.xdmf")
 
 
-def test_time_series():
+@pytest.mark.parametrize("data_format", ["XML", "Binary", "HDF"])
+def test_time_series(data_format):
     # write the data
     filename = "out.xdmf"
 
-    with meshio.xdmf.TimeSeriesWriter(filename) as writer:
+    with meshio.xdmf.TimeSeriesWriter(filename, data_format=data_format) as writer:
         writer.write_points_cells(helpers.tri_mesh_2d.points, helpers.tri_mesh_2d.cells)
         n = helpers.tri_mesh_2d.points.shape[0]
 
@@ -90,6 +91,75 @@ def test_time_series():
                 assert numpy.all(numpy.abs(value - point_data[k][key]) < 1.0e-12)
 
 
+def test_time_series_changing_shape():
+    # an attribute that changes shape or dtype partway through the series is stored
+    # in a new dataset
+    filename = "out.xdmf"
+
+    mesh = helpers.tri_mesh_2d
+    n = mesh.points.shape[0]
+    num_cells = len(mesh.cells["triangle"])
+    times = numpy.linspace(0.0, 1.0, 6)
+    point_data = [
+        {"phi": numpy.full(n, t) if k < 3 else numpy.full((n, 2), t)}
+        for k, t in enumerate(times)
+    ]
+    cell_data = [
+        {
+            "triangle": {
+                "a": numpy.full(num_cells, t)
+                if k % 2 == 0
+                else numpy.arange(num_cells, dtype=numpy.int32) + k
+            }
+        }
+        for k, t in enumerate(times)
+    ]
+
+    with meshio.xdmf.TimeSeriesWriter(filename) as writer:
+        writer.write_points_cells(mesh.points, mesh.cells)
+        for t, pd, cd in zip(times, point_data, cell_data):
+            writer.write_data(t, point_data=pd, cell_data=cd)
+
+    with meshio.xdmf.TimeSeriesReader(filename) as reader:
+        reader.read_points_cells()
+        assert reader.num_steps == len(times)
+        for k in range(reader.num_steps):
+            t, pd, cd = reader.read_data(k)
+            assert numpy.abs(times[k] - t) < 1.0e-12
+            assert pd["phi"].shape == point_data[k]["phi"].shape
+            assert numpy.all(numpy.abs(pd["phi"] - point_data[k]["phi"]) < 1.0e-12)
+            ref = cell_data[k]["triangle"]["a"]
+            assert cd["triangle"]["a"].dtype == ref.dtype
+            assert numpy.all(cd["triangle"]["a"] == ref)
+
+
+@pytest.mark.parametrize("data_format", ["XML", "HDF"])
+def test_time_series_flush(data_format):
+    # flush() persists the steps written so far while the writer is still open
+    filename = "out.xdmf"
+
+    mesh = helpers.tri_mesh_2d
+    n = mesh.points.shape[0]
+    with meshio.xdmf.TimeSeriesWriter(filename, data_format=data_format) as writer:
+        writer.write_points_cells(mesh.points, mesh.cells)
+        for t in [0.0, 0.5]:
+            writer.write_data(t, point_data={"phi": numpy.full(n, t)})
+        writer.flush()
+
+        with meshio.xdmf.TimeSeriesReader(filename) as reader:
+            reader.read_points_cells()
+            assert reader.num_steps == 2
+            for k, t in enumerate([0.0, 0.5]):
+                tk, pd, _ = reader.read_data(k)
+                assert abs(tk - t) < 1.0e-12
+                assert numpy.all(numpy.abs(pd["phi"] - t) < 1.0e-12)
+
+        writer.write_data(1.0, point_data={"phi": numpy.full(n, 1.0)})
+
+    with meshio.xdmf.TimeSeriesReader(filename) as reader:
+        assert reader.num_steps == 3
+
+
 def test_information_xdmf():
     mesh_out = meshio.Mesh(
         numpy.array(
@@ -121,4 +191,4 @@ def test_information_xdmf():
 
 
 if __name__ == "__main__":
-    test_time_series()
+    test_time_series("HDF")